@@ -1,7 +1,7 @@
-"""git_cmd_tool - Gitコマンドをラップしたユーティリティパッケージ"""
-
-from .git_clone_manager import GitCloneManager
-from .git_clone_control import GitCloneControl
-
-__version__ = "0.2.0"
-__all__ = ["GitCloneManager", "GitCloneControl"]
+"""git_cmd_tool - Gitコマンドをラップしたユーティリティパッケージ"""
+
+from .git_clone_manager import GitCloneManager
+from .git_clone_control import GitCloneControl
+
+__version__ = "0.2.0"
+__all__ = ["GitCloneManager", "GitCloneControl"]
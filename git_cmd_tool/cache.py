@@ -0,0 +1,152 @@
+"""cache.py - プロセスをまたいで判定結果を保持するファイルキャッシュ"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# orjsonが利用可能であればJSONの読み書きに使用する（C実装で数倍高速）
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# ロガーの設定
+logger = logging.getLogger(__name__)
+
+# キャッシュファイルの配置先（XDG_CACHE_HOMEがあれば従う）
+_CACHE_FILE = (Path(os.environ.get("XDG_CACHE_HOME",
+                                   str(Path.home() / ".cache")))
+               / "git_cmd_tool" / "exists.json")
+
+# キャッシュの最大エントリ数（超過時は参照が古いものから捨てる）
+_MAX_ENTRIES = 4096
+
+# エントリは path -> [mtime_ns, 判定結果]
+# 辞書の挿入順をLRUの順序として利用する（参照時に末尾へ移動する）
+_lock = threading.Lock()
+_cache: Optional[Dict[str, List]] = None
+_dirty = False
+
+
+def load_cache() -> Dict[str, List]:
+    """
+    キャッシュファイルを読み込む（初回のみ。以降はメモリ上の内容を返す）
+
+    Returns:
+        Dict[str, List]: path -> [mtime_ns, 判定結果] の辞書
+    """
+    global _cache
+
+    # 初期化の判定と代入・atexit登録は他のアクセサ同様ロック下で行う
+    # （複数スレッドからの初回アクセスで片方の辞書が失われないように）
+    with _lock:
+        if _cache is None:
+            try:
+                raw = _CACHE_FILE.read_bytes()
+                if _orjson is not None:
+                    _cache = _orjson.loads(raw)
+                else:
+                    _cache = json.loads(raw.decode('utf-8'))
+            except (OSError, ValueError):
+                # ファイルがない・壊れている場合は空のキャッシュから始める
+                _cache = {}
+            atexit.register(save_cache)
+
+        return _cache
+
+
+def save_cache() -> None:
+    """
+    キャッシュをファイルに保存する（変更がある場合のみ）
+
+    同時に実行中の他プロセスが読みかけのファイルを壊さないよう、
+    一時ファイルに書いてからos.replaceで原子的に置き換える。
+    """
+    global _dirty
+
+    with _lock:
+        if _cache is None or not _dirty:
+            return
+
+        # 上限を超えた分は参照が古いものから捨てる
+        while len(_cache) > _MAX_ENTRIES:
+            _cache.pop(next(iter(_cache)))
+
+        try:
+            _CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            if _orjson is not None:
+                data = _orjson.dumps(_cache)
+            else:
+                data = json.dumps(_cache).encode('utf-8')
+            fd, tmp_path = tempfile.mkstemp(dir=str(_CACHE_FILE.parent))
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, str(_CACHE_FILE))
+            _dirty = False
+        except OSError as e:
+            # キャッシュは高速化のためだけのものなので、保存失敗は警告に留める
+            logger.warning("キャッシュの保存に失敗しました: %s, エラー: %s",
+                           _CACHE_FILE, e)
+
+
+def get_cached(path: str, mtime_ns: int) -> Optional[bool]:
+    """
+    キャッシュから判定結果を取得する
+
+    Args:
+        path (str): 判定対象のパス
+        mtime_ns (int): パスの現在のst_mtime_ns（一致しない場合は無効とみなす）
+
+    Returns:
+        Optional[bool]: キャッシュにあればその判定結果、なければNone
+    """
+    cache = load_cache()
+
+    with _lock:
+        entry = cache.get(path)
+        if entry is None or entry[0] != mtime_ns:
+            return None
+
+        # 参照されたエントリを末尾（最近使用）に移動する
+        cache[path] = cache.pop(path)
+        return bool(entry[1])
+
+
+def set_cached(path: str, mtime_ns: int, value: bool) -> None:
+    """
+    判定結果をキャッシュに登録する
+
+    Args:
+        path (str): 判定対象のパス
+        mtime_ns (int): パスのst_mtime_ns
+        value (bool): 判定結果
+    """
+    global _dirty
+
+    cache = load_cache()
+
+    with _lock:
+        cache.pop(path, None)
+        cache[path] = [mtime_ns, value]
+        _dirty = True
+
+
+def clear_cache() -> None:
+    """メモリ上およびファイル上のキャッシュを破棄する"""
+    global _cache, _dirty
+
+    with _lock:
+        if _cache is not None:
+            _cache.clear()
+        _dirty = False
+        try:
+            _CACHE_FILE.unlink()
+        except OSError:
+            pass
@@ -1,11 +1,25 @@
 """git_clone_control.py - GitCloneControlクラスの実装"""
 
 import logging
-from .git_cmd import create_bare_repository, git_clone, is_git_repository, is_local_path
+import operator
+import sys
+from pathlib import Path
+from typing import Optional
+from .git_cmd import (
+    create_bare_repository,
+    create_bare_repository_async,
+    git_clone,
+    git_clone_async,
+    is_git_repository,
+    is_local_path,
+)
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# from_dictの必須キーを1回の呼び出しでまとめて取り出す
+_REQUIRED_KEYS = operator.itemgetter('name', 'repository_path', 'target_path')
+
 
 class GitCloneControl:
     """
@@ -13,7 +27,14 @@ class GitCloneControl:
     設定に従ってGitコマンドを管理するクラス
     """
 
-    def __init__(self, name: str, repo_path: str, clone_path: str):
+    # マニフェストの行数だけ生成される小さなデータオブジェクトのため、
+    # __dict__を持たせずメモリ使用量と属性アクセスを抑える
+    __slots__ = ("name", "repo_path", "clone_path",
+                 "clone_depth", "blobless", "_is_local",
+                 "_repo_path_obj", "_clone_path_obj")
+
+    def __init__(self, name: str, repo_path: str, clone_path: str,
+                 clone_depth: Optional[int] = None, blobless: bool = False):
         """
         GitCloneControlインスタンスを初期化する
 
@@ -21,11 +42,20 @@ class GitCloneControl:
             name (str): 制御オブジェクトの名前
             repo_path (str): リポジトリのパス（ローカルパスまたはURL）
             clone_path (str): クローン先のパス
+            clone_depth (Optional[int]): 指定時は--depthによるshallowクローンにする
+            blobless (bool): --filter=blob:noneによるpartialクローンにするかどうか
         """
-        self.name = name
+        # 名前はget_control_by_nameの比較キーになるためinternしておく
+        self.name = sys.intern(name)
         self.repo_path = repo_path
         self.clone_path = clone_path
+        self.clone_depth = clone_depth
+        self.blobless = blobless
         self._is_local = is_local_path(repo_path)
+        # Pathオブジェクトは一度だけ構築して使い回す
+        # （repo_pathはリモートURLの場合があるためローカル時のみ）
+        self._repo_path_obj = Path(repo_path) if self._is_local else None
+        self._clone_path_obj = Path(clone_path)
 
         logger.debug("GitCloneControl初期化: %s -> %s (name=%s)",
                      repo_path, clone_path, name)
@@ -50,6 +80,44 @@ class GitCloneControl:
         """クローン先がすでに存在するかどうかを返す"""
         return is_git_repository(self.clone_path)
 
+    def _check_ensure_repository(self, exists: bool) -> Optional[bool]:
+        """
+        ensure_repositoryの作成実行前の共通判定
+
+        Args:
+            exists (bool): repository_existsの判定結果
+
+        Returns:
+            Optional[bool]: 作成が不要な場合はその結果、作成が必要な場合はNone
+        """
+        if not self._is_local:
+            # リモートリポジトリの場合は何もしない
+            logger.debug("リモートリポジトリです: %s", self.repo_path)
+            return True
+
+        if exists:
+            logger.info("リポジトリは既に存在します: %s", self.repo_path)
+            return True
+
+        logger.info("bareリポジトリを作成します: %s", self.repo_path)
+        return None
+
+    def _ensure_repository(self, exists: bool) -> bool:
+        """ensure_repositoryの本体（存在判定の結果を引数で受け取る）"""
+        skip_result = self._check_ensure_repository(exists)
+        if skip_result is not None:
+            return skip_result
+
+        return create_bare_repository(self._repo_path_obj)
+
+    async def _ensure_repository_async(self, exists: bool) -> bool:
+        """_ensure_repositoryの非同期版"""
+        skip_result = self._check_ensure_repository(exists)
+        if skip_result is not None:
+            return skip_result
+
+        return await create_bare_repository_async(self._repo_path_obj)
+
     def ensure_repository(self) -> bool:
         """
         リポジトリの存在を確認し、必要に応じて作成する
@@ -60,24 +128,67 @@ class GitCloneControl:
         Raises:
             Exception: 処理でエラーが発生した場合
         """
-        if not self._is_local:
-            # リモートリポジトリの場合は何もしない
-            logger.debug("リモートリポジトリです: %s", self.repo_path)
+        return self._ensure_repository(self.repository_exists)
+
+    async def ensure_repository_async(self) -> bool:
+        """
+        ensure_repositoryの非同期版
+
+        Returns:
+            bool: 処理が成功した場合True
+
+        Raises:
+            Exception: 処理でエラーが発生した場合
+        """
+        return await self._ensure_repository_async(self.repository_exists)
+
+    def _check_ensure_clone(self, exists: bool, force: bool) -> bool:
+        """
+        ensure_cloneのクローン実行前の共通判定
+
+        Args:
+            exists (bool): clone_existsの判定結果
+            force (bool): 既存のクローンを強制的に上書きするかどうか
+
+        Returns:
+            bool: クローンの実行が必要な場合True
+        """
+        if exists and not force:
+            logger.info("クローンは既に存在します: %s", self.clone_path)
+            return False
+
+        logger.info("クローンを実行します: %s -> %s", self.repo_path, self.clone_path)
+        return True
+
+    def _ensure_clone(self, exists: bool, force: bool,
+                      reference: Optional[str]) -> bool:
+        """ensure_cloneの本体（存在判定の結果を引数で受け取る）"""
+        if not self._check_ensure_clone(exists, force):
             return True
 
-        if self.repository_exists:
-            logger.info("リポジトリは既に存在します: %s", self.repo_path)
+        return git_clone(self.repo_path, self._clone_path_obj, force,
+                         clone_depth=self.clone_depth, blobless=self.blobless,
+                         reference=reference)
+
+    async def _ensure_clone_async(self, exists: bool, force: bool,
+                                  reference: Optional[str]) -> bool:
+        """_ensure_cloneの非同期版"""
+        if not self._check_ensure_clone(exists, force):
             return True
 
-        logger.info("bareリポジトリを作成します: %s", self.repo_path)
-        return create_bare_repository(self.repo_path)
+        return await git_clone_async(self.repo_path, self._clone_path_obj, force,
+                                     clone_depth=self.clone_depth,
+                                     blobless=self.blobless,
+                                     reference=reference)
 
-    def ensure_clone(self, force: bool = False) -> bool:
+    def ensure_clone(self, force: bool = False,
+                     reference: Optional[str] = None) -> bool:
         """
         クローンの存在を確認し、必要に応じてクローンを実行する
 
         Args:
             force (bool): 既存のクローンを強制的に上書きするかどうか
+            reference (Optional[str]): オブジェクトを流用する既存クローンのパス
 
         Returns:
             bool: 処理が成功した場合True
@@ -85,31 +196,78 @@ class GitCloneControl:
         Raises:
             Exception: 処理でエラーが発生した場合
         """
-        if self.clone_exists and not force:
-            logger.info("クローンは既に存在します: %s", self.clone_path)
-            return True
+        return self._ensure_clone(self.clone_exists, force, reference)
 
-        logger.info("クローンを実行します: %s -> %s", self.repo_path, self.clone_path)
-        return git_clone(self.repo_path, self.clone_path, force)
+    async def ensure_clone_async(self, force: bool = False,
+                                 reference: Optional[str] = None) -> bool:
+        """
+        ensure_cloneの非同期版
 
-    def update(self, force: bool = False) -> bool:
+        Args:
+            force (bool): 既存のクローンを強制的に上書きするかどうか
+            reference (Optional[str]): オブジェクトを流用する既存クローンのパス
+
+        Returns:
+            bool: 処理が成功した場合True
+
+        Raises:
+            Exception: 処理でエラーが発生した場合
+        """
+        return await self._ensure_clone_async(self.clone_exists, force, reference)
+
+    def update(self, force: bool = False,
+               reference: Optional[str] = None) -> bool:
         """
         リポジトリとクローンの状態を更新する
 
         Args:
             force (bool): 既存のクローンを強制的に上書きするかどうか
+            reference (Optional[str]): オブジェクトを流用する既存クローンのパス
+
+        Returns:
+            bool: すべての処理が成功した場合True
+        """
+        logger.info("更新を開始します: %s -> %s", self.repo_path, self.clone_path)
+
+        # 存在判定をまとめて1回だけ行い、結果を各処理に引き渡す
+        repo_exists = self.repository_exists
+        clone_exists = self.clone_exists
+
+        # 1. リポジトリの確認・作成
+        if not self._ensure_repository(repo_exists):
+            return False
+
+        # 2. クローンの確認・実行
+        if not self._ensure_clone(clone_exists, force, reference):
+            return False
+
+        logger.info("更新が完了しました: %s -> %s", self.repo_path, self.clone_path)
+        return True
+
+    async def update_async(self, force: bool = False,
+                           reference: Optional[str] = None) -> bool:
+        """
+        updateの非同期版
+
+        Args:
+            force (bool): 既存のクローンを強制的に上書きするかどうか
+            reference (Optional[str]): オブジェクトを流用する既存クローンのパス
 
         Returns:
             bool: すべての処理が成功した場合True
         """
         logger.info("更新を開始します: %s -> %s", self.repo_path, self.clone_path)
 
+        # 存在判定をまとめて1回だけ行い、結果を各処理に引き渡す
+        repo_exists = self.repository_exists
+        clone_exists = self.clone_exists
+
         # 1. リポジトリの確認・作成
-        if not self.ensure_repository():
+        if not await self._ensure_repository_async(repo_exists):
             return False
 
         # 2. クローンの確認・実行
-        if not self.ensure_clone(force):
+        if not await self._ensure_clone_async(clone_exists, force, reference):
             return False
 
         logger.info("更新が完了しました: %s -> %s", self.repo_path, self.clone_path)
@@ -125,23 +283,39 @@ class GitCloneControl:
                 - name (str): 制御オブジェクトの名前
                 - repository_path (str): リポジトリのパス
                 - target_path (str): クローン先のパス
+                - depth (int, optional): shallowクローンの深さ
+                - filter (str, optional): partialクローンのフィルタ（"blob:none"のみ対応）
                 - force_overwrite (bool, optional): 強制上書きフラグ（現在は使用せず）
 
         Returns:
             GitCloneControl: 生成されたGitCloneControlインスタンス
         """
-        name = data.get('name')
-        repo_path = data.get('repository_path')
-        clone_path = data.get('target_path')
-
-        if not name:
-            raise ValueError("nameが指定されていません")
-        if not repo_path:
-            raise ValueError("repository_pathが指定されていません")
-        if not clone_path:
-            raise ValueError("target_pathが指定されていません")
-
-        return cls(name, repo_path, clone_path)
+        try:
+            name, repo_path, clone_path = _REQUIRED_KEYS(data)
+        except KeyError as e:
+            raise ValueError("%sが指定されていません" % e.args[0]) from e
+
+        if not (name and repo_path and clone_path):
+            # キーはあるが値が空の場合
+            missing = ('name' if not name
+                       else 'repository_path' if not repo_path
+                       else 'target_path')
+            raise ValueError("%sが指定されていません" % missing)
+
+        clone_depth = data.get('depth')
+        clone_filter = data.get('filter')
+
+        # boolはintのサブクラスのため明示的に除外する
+        if clone_depth is not None and (isinstance(clone_depth, bool)
+                                        or not isinstance(clone_depth, int)
+                                        or clone_depth < 1):
+            raise ValueError("depthは1以上の整数を指定してください: %s" % clone_depth)
+        if clone_filter is not None and clone_filter != 'blob:none':
+            raise ValueError("filterは'blob:none'のみ指定できます: %s" % clone_filter)
+
+        return cls(name, repo_path, clone_path,
+                   clone_depth=clone_depth,
+                   blobless=clone_filter == 'blob:none')
 
     def to_dict(self) -> dict:
         """
@@ -150,11 +324,16 @@ class GitCloneControl:
         Returns:
             dict: 設定データを含む辞書
         """
-        return {
+        data = {
             'name': self.name,
             'repository_path': self.repo_path,
             'target_path': self.clone_path,
         }
+        if self.clone_depth is not None:
+            data['depth'] = self.clone_depth
+        if self.blobless:
+            data['filter'] = 'blob:none'
+        return data
 
     def __str__(self) -> str:
         """文字列表現を返す"""
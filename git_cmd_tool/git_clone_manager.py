@@ -1,11 +1,19 @@
 """git_clone_manager.py - GitCloneManagerクラスの実装"""
 
+import asyncio
 import json
 import logging
+import os
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
 from .git_clone_control import GitCloneControl
 
+# orjsonが利用可能であればJSONの読み書きに使用する（C実装で数倍高速）
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
@@ -18,6 +26,8 @@ class GitCloneManager:
     def __init__(self):
         """GitCloneManagerインスタンスを初期化する"""
         self.controls: List[GitCloneControl] = []
+        # 名前検索用のインデックス（self.controlsと常に同期させる）
+        self._by_name: Dict[str, GitCloneControl] = {}
         logger.debug("GitCloneManagerを初期化しました")
 
     def appendControl(self, control: GitCloneControl) -> None:
@@ -26,11 +36,18 @@ class GitCloneManager:
 
         Args:
             control (GitCloneControl): 追加するGitCloneControlインスタンス
+
+        Raises:
+            ValueError: 同じ名前の制御オブジェクトが既に存在する場合
         """
         if not isinstance(control, GitCloneControl):
             raise TypeError("GitCloneControlインスタンスを指定してください")
 
+        if control.name in self._by_name:
+            raise ValueError("同じ名前の制御オブジェクトが既に存在します: %s" % control.name)
+
         self.controls.append(control)
+        self._by_name[control.name] = control
         logger.debug("GitCloneControlを追加しました: %s", control)
 
     def removeControl(self, control: GitCloneControl) -> bool:
@@ -45,6 +62,7 @@ class GitCloneManager:
         """
         try:
             self.controls.remove(control)
+            self._by_name.pop(control.name, None)
             logger.debug("GitCloneControlを削除しました: %s", control)
             return True
         except ValueError:
@@ -55,11 +73,34 @@ class GitCloneManager:
         """すべてのGitCloneControlを削除する"""
         count = len(self.controls)
         self.controls.clear()
+        self._by_name.clear()
         logger.info("%d個のGitCloneControlを削除しました", count)
 
-    def getControls(self) -> List[GitCloneControl]:
+    def getControls(self) -> Iterator[GitCloneControl]:
         """
-        登録されているすべてのGitCloneControlのリストを返す
+        登録されているすべてのGitCloneControlのイテレータを返す
+
+        リストのコピーを避けるため読み取り専用のイテレータを返す。
+        走査中に制御オブジェクトを追加・削除しないこと。
+        独立したリストが必要な場合はcopy_controls()を使用する。
+
+        Returns:
+            Iterator[GitCloneControl]: GitCloneControlのイテレータ
+        """
+        return iter(self.controls)
+
+    def iter_controls(self) -> Iterator[GitCloneControl]:
+        """
+        登録されているすべてのGitCloneControlのイテレータを返す
+
+        Returns:
+            Iterator[GitCloneControl]: GitCloneControlのイテレータ
+        """
+        return iter(self.controls)
+
+    def copy_controls(self) -> List[GitCloneControl]:
+        """
+        登録されているすべてのGitCloneControlのリストのコピーを返す
 
         Returns:
             List[GitCloneControl]: GitCloneControlのリスト
@@ -94,10 +135,7 @@ class GitCloneManager:
         Returns:
             Optional[GitCloneControl]: 見つかった場合はGitCloneControl、見つからない場合はNone
         """
-        for control in self.controls:
-            if control.name == name:
-                return control
-        return None
+        return self._by_name.get(name)
 
     def has_control_name(self, name: str) -> bool:
         """
@@ -109,7 +147,7 @@ class GitCloneManager:
         Returns:
             bool: 存在する場合True
         """
-        return any(control.name == name for control in self.controls)
+        return name in self._by_name
 
     def update_by_name(self, name: str, force: bool = False) -> bool:
         """
@@ -156,8 +194,11 @@ class GitCloneManager:
         if not json_file.exists():
             raise FileNotFoundError("JSONファイルが見つかりません: %s", json_path)
 
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if _orjson is not None:
+            data = _orjson.loads(json_file.read_bytes())
+        else:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
 
         return self.load_from_dict(data)
 
@@ -203,8 +244,12 @@ class GitCloneManager:
         json_file = Path(json_path)
         json_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if _orjson is not None:
+            # orjsonはUTF-8のバイト列を直接返すためstr経由の変換が不要
+            json_file.write_bytes(_orjson.dumps(data, option=_orjson.OPT_INDENT_2))
+        else:
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
 
         logger.info("%d個の制御オブジェクトをJSONファイルに保存しました: %s",
                     len(self.controls), json_path)
@@ -220,13 +265,36 @@ class GitCloneManager:
             'controls': [control.to_dict() for control in self.controls]
         }
 
-    def update(self, force: bool = False, stop_on_error: bool = False) -> bool:
+    def update(self, force: bool = False, stop_on_error: bool = False,
+               max_workers: Optional[int] = None) -> bool:
         """
-        すべてのGitCloneControlを一斉に実行する
+        すべてのGitCloneControlを並列に実行する（update_asyncの同期ラッパー）
 
         Args:
             force (bool): 既存のクローンを強制的に上書きするかどうか
-            stop_on_error (bool): エラー発生時に処理を停止するかどうか
+            stop_on_error (bool): エラー発生時に残りの処理をキャンセルするかどうか
+            max_workers (Optional[int]): 並列実行数（省略時はCPU数、最大8）
+
+        Returns:
+            bool: すべての処理が成功した場合True
+
+        Raises:
+            Exception: stop_on_errorがTrueでエラーが発生した場合
+        """
+        return asyncio.run(self.update_async(force, stop_on_error, max_workers))
+
+    async def update_async(self, force: bool = False, stop_on_error: bool = False,
+                           max_workers: Optional[int] = None) -> bool:
+        """
+        すべてのGitCloneControlをイベントループ上で並列に実行する
+
+        各GitCloneControlは互いに独立しているため、gitサブプロセスを
+        一斉に起動してI/O待ちを重ね合わせ、全体の実行時間を短縮する。
+
+        Args:
+            force (bool): 既存のクローンを強制的に上書きするかどうか
+            stop_on_error (bool): エラー発生時に未開始の処理をキャンセルするかどうか
+            max_workers (Optional[int]): 同時に実行するgitプロセス数（省略時はCPU数、最大8）
 
         Returns:
             bool: すべての処理が成功した場合True
@@ -238,39 +306,91 @@ class GitCloneManager:
             logger.warning("実行するGitCloneControlがありません")
             return True
 
-        logger.info("%d個のリポジトリ処理を開始します", len(self.controls))
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 1)
+        max_workers = max(1, min(max_workers, len(self.controls)))
+
+        logger.info("%d個のリポジトリ処理を開始します (並列数: %d)",
+                    len(self.controls), max_workers)
+
+        # 同じリポジトリを指す制御が複数ある場合、2つ目以降は最初の制御の
+        # クローンをreferenceとして流用し、オブジェクトの再取得を省略する
+        first_clone: Dict[str, str] = {}
+        references: List[Optional[str]] = []
+        for control in self.controls:
+            references.append(first_clone.get(control.repo_path))
+            first_clone.setdefault(control.repo_path, control.clone_path)
+
+        # reference先のクローンが完了する前に2つ目以降を開始すると
+        # --reference-if-ableがフォールバックして流用が効かないため、
+        # 同じリポジトリを指すグループ内はロックで直列化する
+        # （タスクはリスト順に起動されるため、reference元が先にロックを取る）
+        repo_locks: Dict[str, asyncio.Lock] = {}
+        for control, reference in zip(self.controls, references):
+            if reference is not None:
+                repo_locks.setdefault(control.repo_path, asyncio.Lock())
+
+        semaphore = asyncio.Semaphore(max_workers)
+        stopped = asyncio.Event()
 
         success_count = 0
         error_count = 0
         errors = []
+        stop_error: Optional[Exception] = None
+
+        async def run_one(i: int, control: GitCloneControl) -> None:
+            nonlocal success_count, error_count, stop_error
+
+            async with semaphore:
+                if stopped.is_set():
+                    logger.warning("[%d/%d] 処理キャンセル: %s", i,
+                                   len(self.controls), control)
+                    return
 
-        for i, control in enumerate(self.controls, 1):
-            try:
                 logger.info("[%d/%d] 処理開始: %s", i, len(self.controls), control)
 
-                if control.update(force):
-                    success_count += 1
-                    logger.info("[%d/%d] 処理成功: %s", i,
-                                len(self.controls), control)
-                else:
+                try:
+                    lock = repo_locks.get(control.repo_path)
+                    if lock is not None:
+                        async with lock:
+                            result = await control.update_async(
+                                force, reference=references[i - 1])
+                    else:
+                        result = await control.update_async(
+                            force, reference=references[i - 1])
+
+                    if result:
+                        success_count += 1
+                        logger.info("[%d/%d] 処理成功: %s", i,
+                                    len(self.controls), control)
+                    else:
+                        error_count += 1
+                        error_msg = "[%d/%d] 処理失敗: %s" % (i,
+                                                          len(self.controls), control)
+                        logger.error(error_msg)
+                        errors.append(error_msg)
+
+                        if stop_on_error and stop_error is None:
+                            stop_error = Exception(
+                                "エラーにより処理を停止しました: %s" % control)
+                            stopped.set()
+
+                except Exception as e:
                     error_count += 1
-                    error_msg = "[%d/%d] 処理失敗: %s" % (i,
-                                                      len(self.controls), control)
+                    error_msg = "[%d/%d] エラー発生: %s, エラー: %s" % (
+                        i, len(self.controls), control, e)
                     logger.error(error_msg)
                     errors.append(error_msg)
 
-                    if stop_on_error:
-                        raise Exception("エラーにより処理を停止しました: %s" % control)
+                    if stop_on_error and stop_error is None:
+                        stop_error = Exception("エラーにより処理を停止しました: %s" % e)
+                        stopped.set()
 
-            except Exception as e:
-                error_count += 1
-                error_msg = "[%d/%d] エラー発生: %s, エラー: %s" % (
-                    i, len(self.controls), control, e)
-                logger.error(error_msg)
-                errors.append(error_msg)
+        await asyncio.gather(*[run_one(i, control)
+                               for i, control in enumerate(self.controls, 1)])
 
-                if stop_on_error:
-                    raise Exception("エラーにより処理を停止しました: %s" % e)
+        if stop_error is not None:
+            raise stop_error
 
         # 結果のサマリーを出力
         logger.info("処理完了 - 成功: %d, 失敗: %d", success_count, error_count)
@@ -278,7 +398,7 @@ class GitCloneManager:
         if errors:
             logger.warning("以下のエラーが発生しました:")
             for error in errors:
-                logger.warning(f"  - {error}")
+                logger.warning("  - %s", error)
 
         return error_count == 0
 
@@ -290,20 +410,31 @@ class GitCloneManager:
             List[str]: 検証エラーのリスト（空の場合は問題なし）
         """
         errors = []
+        seen: Dict[str, int] = {}
+
+        # 親ディレクトリごとに1回だけスキャンして存在確認をまとめる
+        # （同じマニフェスト内の制御は親ディレクトリを共有することが多い）
+        parent_entries: Dict[str, Optional[frozenset]] = {}
+
+        def scan_parent(parent: str) -> Optional[frozenset]:
+            if parent not in parent_entries:
+                try:
+                    parent_entries[parent] = frozenset(os.listdir(parent))
+                except OSError:
+                    parent_entries[parent] = None
+            return parent_entries[parent]
 
         for i, control in enumerate(self.controls, 1):
             try:
-                # パスの重複チェック
-                for j, other_control in enumerate(self.controls, 1):
-                    if i != j and control.clone_path == other_control.clone_path:
-                        errors.append(f"クローン先パスが重複しています: {control.clone_path}")
+                # パスの重複チェック（同じパスは1件だけ報告する）
+                if seen.setdefault(control.clone_path, i) != i:
+                    errors.append(f"クローン先パスが重複しています: {control.clone_path}")
 
                 # ローカルリポジトリの存在チェック
                 if control.is_local_repository and not control.repository_exists:
                     # 作成可能かどうかの簡単なチェック
-                    from pathlib import Path
                     repo_path = Path(control.repo_path)
-                    if not repo_path.parent.exists():
+                    if scan_parent(str(repo_path.parent)) is None:
                         errors.append(
                             f"リポジトリの親ディレクトリが存在しません: {control.repo_path}")
 
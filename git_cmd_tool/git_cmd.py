@@ -1,128 +1,426 @@
-"""git_cmd.py - subprocessを使ってGitコマンドをラップした関数
-"""
-
-import subprocess
-import logging
-import shutil
-from pathlib import Path
-
-# ロガーの設定
-logger = logging.getLogger(__name__)
-
-
-def create_bare_repository(repo_path: str) -> bool:
-    """
-    ローカルにGit bareリポジトリを作成する
-
-    Args:
-        repo_path (str): 作成するbareリポジトリのパス
-
-    Returns:
-        bool: 作成に成功した場合True、失敗した場合False
-    """
-    repo_path_obj = Path(repo_path)
-
-    # ディレクトリが存在しない場合は作成
-    if not repo_path_obj.exists():
-        repo_path_obj.mkdir(parents=True, exist_ok=True)
-        logger.info("ディレクトリを作成しました: %s", repo_path)
-
-    # 既にGitリポジトリの場合はスキップ
-    if (repo_path_obj / ".git").exists() or (repo_path_obj / "HEAD").exists():
-        logger.info("既存のリポジトリをスキップしました: %s", repo_path)
-        return True
-
-    # git init --bare を実行
-    result = subprocess.run(
-        ["git", "init", "--bare", str(repo_path_obj)],
-        capture_output=True,
-        text=True,
-        check=True
-    )
-
-    logger.info("bareリポジトリを作成しました: %s", repo_path)
-    return True
-
-
-def git_clone(repo_url: str, clone_path: str, force: bool = False) -> bool:
-    """
-    Git cloneを実行する
-
-    Args:
-        repo_url (str): クローン元のリポジトリURL
-        clone_path (str): クローン先のパス
-        force (bool): 既存のディレクトリを上書きするかどうか
-
-    Returns:
-        bool: クローンに成功した場合True、失敗した場合False
-    """
-    clone_path_obj = Path(clone_path)
-
-    # 既にディレクトリが存在する場合の処理
-    if clone_path_obj.exists():
-        if force:
-            logger.warning("既存のディレクトリを削除します: %s", clone_path)
-            shutil.rmtree(clone_path)
-        else:
-            # .gitディレクトリが存在する場合はスキップ
-            if (clone_path_obj / ".git").exists():
-                logger.info("既存のリポジトリをスキップしました: %s", clone_path)
-                return True
-            else:
-                logger.warning("既存のディレクトリが存在します: %s", clone_path)
-                return False
-
-    # 親ディレクトリを作成
-    clone_path_obj.parent.mkdir(parents=True, exist_ok=True)
-
-    # git clone を実行
-    result = subprocess.run(
-        ["git", "clone", repo_url, str(clone_path_obj)],
-        capture_output=True,
-        text=True,
-        check=True
-    )
-
-    logger.info("リポジトリをクローンしました: %s -> %s", repo_url, clone_path)
-    return True
-
-
-def is_git_repository(path: str) -> bool:
-    """
-    指定されたパスがGitリポジトリかどうかを判定する
-
-    Args:
-        path (str): 判定するパス
-
-    Returns:
-        bool: Gitリポジトリの場合True、そうでなければFalse
-    """
-    path_obj = Path(path)
-
-    # 通常のリポジトリ（.gitディレクトリが存在）
-    if (path_obj / ".git").exists():
-        return True
-
-    # bareリポジトリ（HEADファイルが存在）
-    if (path_obj / "HEAD").exists():
-        return True
-
-    return False
-
-
-def is_local_path(repo_path: str) -> bool:
-    """
-    指定されたパスがローカルパスかどうかを判定する
-
-    Args:
-        repo_path (str): 判定するパス
-
-    Returns:
-        bool: ローカルパスの場合True、URLの場合False
-    """
-    # URLスキーマで始まる場合はリモート
-    if repo_path.startswith(("http://", "https://", "git://", "ssh://", "git@")):
-        return False
-
-    # それ以外はローカルパスとして扱う
-    return True
+"""git_cmd.py - subprocessを使ってGitコマンドをラップした関数
+"""
+
+import asyncio
+import functools
+import os
+import subprocess
+import sys
+import logging
+import shutil
+from pathlib import Path
+from typing import List, Optional, Union
+
+from . import cache
+
+# ロガーの設定
+logger = logging.getLogger(__name__)
+
+# リモートリポジトリと判定するURLスキーマのプレフィックス
+_REMOTE_PREFIXES = ("http://", "https://", "git://", "ssh://", "git@")
+
+# パスを受け取る関数の引数型（strまたはPath）
+StrPath = Union[str, os.PathLike]
+
+
+def _as_path(path: StrPath) -> Path:
+    """既にPathであれば再構築せずそのまま返す"""
+    return path if isinstance(path, Path) else Path(path)
+
+
+def _run_git(cmd: List[str]) -> None:
+    """Gitコマンドを実行し、失敗時はCalledProcessErrorを送出する
+
+    標準出力は使用しないためバッファリングせずに捨てる。
+    標準エラーはCalledProcessError.stderrとして参照できるよう保持する。
+    """
+    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                   text=True, check=True)
+
+
+async def _run_git_async(cmd: List[str]) -> None:
+    """Gitコマンドを非同期に実行し、失敗時はCalledProcessErrorを送出する"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd,
+            stderr=stderr.decode(errors="replace"))
+
+
+def _remove_tree(path: StrPath) -> None:
+    """
+    ディレクトリツリーを削除する
+
+    POSIX環境ではrmコマンドに委譲する。Pythonで再帰的にunlinkする
+    shutil.rmtreeより、ファイル数の多いワークツリーで数倍速い。
+    rmが使えない環境ではshutil.rmtreeにフォールバックする。
+    """
+    if sys.platform != "win32":
+        try:
+            subprocess.run(["rm", "-rf", "--", str(_as_path(path))], check=True)
+            return
+        except (OSError, subprocess.CalledProcessError):
+            logger.debug("rmコマンドでの削除に失敗したためshutil.rmtreeを使用します: %s", path)
+
+    shutil.rmtree(path)
+
+
+def _prepare_bare_repository(repo_path: StrPath) -> Optional[bool]:
+    """
+    create_bare_repositoryのコマンド実行前の共通処理
+
+    Returns:
+        Optional[bool]: 処理を打ち切る場合はその結果、コマンド実行が必要な場合はNone
+    """
+    repo_path_obj = _as_path(repo_path)
+
+    # ディレクトリが存在しない場合は作成
+    if not repo_path_obj.exists():
+        repo_path_obj.mkdir(parents=True, exist_ok=True)
+        logger.info("ディレクトリを作成しました: %s", repo_path)
+
+    # 既にGitリポジトリの場合はスキップ
+    if (repo_path_obj / ".git").exists() or (repo_path_obj / "HEAD").exists():
+        logger.info("既存のリポジトリをスキップしました: %s", repo_path)
+        return True
+
+    return None
+
+
+def _prepare_clone_path(repo_url: str, clone_path: StrPath,
+                        force: bool) -> Optional[bool]:
+    """
+    git_cloneのコマンド実行前の共通処理
+
+    Returns:
+        Optional[bool]: 処理を打ち切る場合はその結果、コマンド実行が必要な場合はNone
+    """
+    clone_path_obj = _as_path(clone_path)
+
+    # 既にディレクトリが存在する場合の処理
+    if clone_path_obj.exists():
+        if force:
+            logger.warning("既存のディレクトリを削除します: %s", clone_path)
+            _remove_tree(clone_path)
+        else:
+            # .gitディレクトリが存在する場合はスキップ
+            if (clone_path_obj / ".git").exists():
+                logger.info("既存のリポジトリをスキップしました: %s", clone_path)
+                return True
+            else:
+                logger.warning("既存のディレクトリが存在します: %s", clone_path)
+                return False
+
+    # 親ディレクトリを作成
+    clone_path_obj.parent.mkdir(parents=True, exist_ok=True)
+    return None
+
+
+def _build_clone_cmd(repo_url: str, clone_path: StrPath,
+                     clone_depth: Optional[int],
+                     blobless: bool,
+                     reference: Optional[str]) -> List[str]:
+    """git cloneのコマンドラインを組み立てる"""
+    # --quietで進捗出力自体を抑止する（出力は誰も読まない）
+    cmd = ["git", "clone", "--quiet"]
+    if clone_depth:
+        cmd += ["--depth", str(clone_depth), "--single-branch"]
+    if blobless:
+        cmd.append("--filter=blob:none")
+    if reference:
+        cmd += ["--reference-if-able", reference, "--dissociate"]
+    cmd += [repo_url, str(_as_path(clone_path))]
+    return cmd
+
+
+def create_bare_repository(repo_path: StrPath) -> bool:
+    """
+    ローカルにGit bareリポジトリを作成する
+
+    Args:
+        repo_path (StrPath): 作成するbareリポジトリのパス
+
+    Returns:
+        bool: 作成に成功した場合True、失敗した場合False
+    """
+    skip_result = _prepare_bare_repository(repo_path)
+    if skip_result is not None:
+        return skip_result
+
+    # git init --bare を実行
+    _run_git(["git", "init", "--bare", str(_as_path(repo_path))])
+
+    # 新しく作成したリポジトリが「リポジトリではない」と誤判定されないようにする
+    is_git_repository.cache_clear()
+
+    logger.info("bareリポジトリを作成しました: %s", repo_path)
+    return True
+
+
+async def create_bare_repository_async(repo_path: StrPath) -> bool:
+    """
+    create_bare_repositoryの非同期版
+
+    Args:
+        repo_path (StrPath): 作成するbareリポジトリのパス
+
+    Returns:
+        bool: 作成に成功した場合True、失敗した場合False
+    """
+    skip_result = _prepare_bare_repository(repo_path)
+    if skip_result is not None:
+        return skip_result
+
+    # git init --bare を実行
+    await _run_git_async(["git", "init", "--bare", str(_as_path(repo_path))])
+
+    # 新しく作成したリポジトリが「リポジトリではない」と誤判定されないようにする
+    is_git_repository.cache_clear()
+
+    logger.info("bareリポジトリを作成しました: %s", repo_path)
+    return True
+
+
+def git_clone(repo_url: str, clone_path: StrPath, force: bool = False,
+              clone_depth: Optional[int] = None,
+              blobless: bool = False,
+              reference: Optional[str] = None) -> bool:
+    """
+    Git cloneを実行する
+
+    clone_depth / bloblessを指定すると転送量を抑えたクローンになる。
+    後から全履歴が必要になった場合は ``git fetch --unshallow`` /
+    ``git fetch --refetch`` で取得できる。
+    referenceには同じリポジトリの既存クローンを指定でき、
+    オブジェクトの再取得を省略する（--reference-if-ableのため、
+    参照先が存在しない場合は通常のクローンにフォールバックする）。
+
+    Args:
+        repo_url (str): クローン元のリポジトリURL
+        clone_path (StrPath): クローン先のパス
+        force (bool): 既存のディレクトリを上書きするかどうか
+        clone_depth (Optional[int]): 指定時は--depthによるshallowクローンにする
+        blobless (bool): --filter=blob:noneによるpartialクローンにするかどうか
+        reference (Optional[str]): オブジェクトを流用する既存クローンのパス
+
+    Returns:
+        bool: クローンに成功した場合True、失敗した場合False
+    """
+    skip_result = _prepare_clone_path(repo_url, clone_path, force)
+    if skip_result is not None:
+        return skip_result
+
+    # git clone を実行
+    _run_git(_build_clone_cmd(repo_url, clone_path, clone_depth, blobless,
+                              reference))
+
+    # 新しく作成したクローンが「リポジトリではない」と誤判定されないようにする
+    is_git_repository.cache_clear()
+
+    logger.info("リポジトリをクローンしました: %s -> %s", repo_url, clone_path)
+    return True
+
+
+async def git_clone_async(repo_url: str, clone_path: StrPath,
+                          force: bool = False,
+                          clone_depth: Optional[int] = None,
+                          blobless: bool = False,
+                          reference: Optional[str] = None) -> bool:
+    """
+    git_cloneの非同期版
+
+    Args:
+        repo_url (str): クローン元のリポジトリURL
+        clone_path (StrPath): クローン先のパス
+        force (bool): 既存のディレクトリを上書きするかどうか
+        clone_depth (Optional[int]): 指定時は--depthによるshallowクローンにする
+        blobless (bool): --filter=blob:noneによるpartialクローンにするかどうか
+        reference (Optional[str]): オブジェクトを流用する既存クローンのパス
+
+    Returns:
+        bool: クローンに成功した場合True、失敗した場合False
+    """
+    skip_result = _prepare_clone_path(repo_url, clone_path, force)
+    if skip_result is not None:
+        return skip_result
+
+    # git clone を実行
+    await _run_git_async(_build_clone_cmd(repo_url, clone_path, clone_depth,
+                                          blobless, reference))
+
+    # 新しく作成したクローンが「リポジトリではない」と誤判定されないようにする
+    is_git_repository.cache_clear()
+
+    logger.info("リポジトリをクローンしました: %s -> %s", repo_url, clone_path)
+    return True
+
+
+@functools.lru_cache(maxsize=1024)
+def is_git_repository(path: str) -> bool:
+    """
+    指定されたパスがGitリポジトリかどうかを判定する
+
+    結果はパスごとにキャッシュされる。1回の処理中にファイルシステムの
+    状態は変わらない前提のため、リポジトリを作成・削除した後は
+    ``is_git_repository.cache_clear()`` でキャッシュを破棄すること
+    （create_bare_repository / git_clone は成功時に自動で破棄する）。
+
+    さらに判定結果はディレクトリのmtimeをキーにファイルキャッシュにも
+    保存され、CI等で本ツールを繰り返し起動する場合に2回目以降の
+    プロセスでも再利用される（cacheモジュール参照）。
+
+    Args:
+        path (str): 判定するパス
+
+    Returns:
+        bool: Gitリポジトリの場合True、そうでなければFalse
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        # パスが存在しない・権限がない場合
+        return False
+
+    # ディレクトリ内容が変わるとmtimeも変わるため、mtimeが一致する
+    # 限り前回プロセスの判定結果をそのまま使える
+    cached = cache.get_cached(path, mtime_ns)
+    if cached is not None:
+        return cached
+
+    # listdir 1回（getdents）で済ませる。exists()を2回呼ぶより
+    # システムコールが少ない
+    try:
+        entries = os.listdir(path)
+    except OSError:
+        # ディレクトリでない場合
+        return False
+
+    # 通常のリポジトリ（.gitディレクトリ）またはbareリポジトリ（HEADファイル）
+    result = ".git" in entries or "HEAD" in entries
+    cache.set_cached(path, mtime_ns, result)
+    return result
+
+
+class GitBatch:
+    """
+    1つのgitプロセスで複数のオブジェクト問い合わせを行うコンテキストマネージャ
+
+    ``git cat-file --batch-check`` を常駐させ、オブジェクト名を1行ずつ
+    書き込んで結果行を読み取る。問い合わせごとにgitを起動すると
+    fork+execのコスト（数ミリ秒）が毎回かかるが、本クラスでは
+    プロセス1つに償却される。リポジトリ内容の厳密な確認を多数の
+    オブジェクトに対して行う場合に使用する。
+
+    使用例:
+        with GitBatch("/path/to/repo.git") as batch:
+            if batch.object_exists("HEAD"):
+                ...
+    """
+
+    def __init__(self, repo_path: StrPath):
+        """
+        GitBatchインスタンスを初期化する
+
+        Args:
+            repo_path (StrPath): 問い合わせ対象のリポジトリのパス
+        """
+        self.repo_path = str(_as_path(repo_path))
+        self._proc: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> 'GitBatch':
+        self._proc = subprocess.Popen(
+            ["git", "-C", self.repo_path, "cat-file", "--batch-check"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._proc is not None:
+            # プロセスが既に死んでいる場合、stdinのcloseは
+            # バッファ書き出しでBrokenPipeErrorになることがある
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+            self._proc.stdout.close()
+            self._proc.stderr.close()
+            self._proc.wait()
+            self._proc = None
+
+    def _process_died(self) -> RuntimeError:
+        """終了したバッチプロセスのstderrを回収してRuntimeErrorを組み立てる"""
+        stderr = self._proc.stderr.read().strip()
+        self._proc.wait()
+        return RuntimeError(
+            "git cat-file --batch-checkが終了しました: %s, エラー: %s"
+            % (self.repo_path, stderr or "不明"))
+
+    def check(self, object_name: str) -> str:
+        """
+        オブジェクト名を問い合わせ、結果行を返す
+
+        Args:
+            object_name (str): 問い合わせるオブジェクト名（リビジョン等）
+
+        Returns:
+            str: "<oid> <type> <size>" または "<object_name> missing" 形式の結果行
+
+        Raises:
+            RuntimeError: バッチプロセスが終了している場合
+                （repo_pathがリポジトリでない場合など）
+        """
+        if self._proc is None:
+            raise RuntimeError("GitBatchはwithブロック内で使用してください")
+
+        try:
+            self._proc.stdin.write(object_name + "\n")
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise self._process_died() from None
+
+        line = self._proc.stdout.readline()
+        if not line:
+            # EOF: プロセスが問い合わせに応答せず終了した
+            raise self._process_died()
+
+        return line.rstrip("\n")
+
+    def object_exists(self, object_name: str) -> bool:
+        """
+        オブジェクトがリポジトリに存在するかどうかを返す
+
+        Args:
+            object_name (str): 問い合わせるオブジェクト名（リビジョン等）
+
+        Returns:
+            bool: オブジェクトが存在する場合True
+
+        Raises:
+            RuntimeError: バッチプロセスが終了している場合
+        """
+        return not self.check(object_name).endswith(" missing")
+
+
+@functools.lru_cache(maxsize=4096)
+def is_local_path(repo_path: str) -> bool:
+    """
+    指定されたパスがローカルパスかどうかを判定する
+
+    同じURLを指す制御が多数ある場合に備えて結果をキャッシュする。
+
+    Args:
+        repo_path (str): 判定するパス
+
+    Returns:
+        bool: ローカルパスの場合True、URLの場合False
+    """
+    # URLスキーマで始まる場合はリモート、それ以外はローカルパスとして扱う
+    return not repo_path.startswith(_REMOTE_PREFIXES)